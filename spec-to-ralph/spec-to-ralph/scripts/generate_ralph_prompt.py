@@ -6,21 +6,89 @@ Supports both flat and feature-based Spec Kit structures.
 
 Usage:
     python generate_ralph_prompt.py [project_path] [options]
+    python generate_ralph_prompt.py mark TASK_ID|LINE [project_path] --done|--blocked [--feature ID]
 
 Options:
     --feature FEATURES    Feature selection: 'all', single ID, or comma-separated list
     --max-iterations N    Override auto-calculated iterations
+    --page-size N         Features per PROMPT.md window (0 disables paging)
     --json                Output results as JSON
 """
 
 import argparse
+import fnmatch
+import hashlib
 import os
 import re
+import shlex
 import sys
 import json
+import tempfile
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Optional, List, Tuple, Dict
+from dataclasses import dataclass, field, asdict
+from typing import Optional, List, Tuple, Dict, Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, atomic replace still applies
+    fcntl = None
+
+
+SCRIPT_PATH = Path(__file__).resolve()
+
+# Multi-feature prompts page the feature list above this many features
+PAGING_THRESHOLD = 20
+DEFAULT_PAGE_SIZE = 10
+INDEX_FILENAME = "ralph-index.md"
+
+# Compiled constitution, shared by all features and reused while sources are unchanged
+CONSTITUTION_INDEX_FILENAME = ".constitution-index.json"
+CONSTITUTION_INDEX_VERSION = 3
+
+
+@dataclass
+class Workspace:
+    """Package discovered from a manifest on disk"""
+    path: str                         # Relative to project root, e.g. "packages/api" ("." for root)
+    stack: str                        # "node", "python", "rust" or "go"
+    name: str = ""                    # Package/module name from the manifest
+    member: bool = False              # Listed by a root workspace manifest (npm/Cargo)
+    typescript: bool = False          # Has a tsconfig.json next to its package.json
+
+
+@dataclass
+class Rule:
+    """Single rule compiled from a constitution"""
+    id: str                           # Explicit ID (e.g. "SEC-2") or generated from section
+    text: str
+    section: str = ""
+    severity: str = "should"          # "must", "should" or "may"
+    source: str = "global"            # "global" or the feature ID of a feature-local constitution
+    explicit: bool = False            # ID was written in the constitution
+    keywords: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ConstitutionIndex:
+    """Compiled constitution.md plus feature-local overrides"""
+    hash: str
+    sections: List[str] = field(default_factory=list)
+    rules: List[Rule] = field(default_factory=list)
+    overrides: Dict[str, List[Rule]] = field(default_factory=dict)
+
+
+@dataclass
+class Task:
+    """Checkbox task located in tasks.md"""
+    line: int                         # 1-based line number
+    offset: int                       # Byte offset of the status character inside "[ ]"
+    status: str                       # " " (open) or "x" (done)
+    text: str                         # Task text after the checkbox
+    id: str = ""                      # Spec Kit task ID, e.g. "T012"
+    
+    @property
+    def blocked(self) -> bool:
+        return self.text.startswith("BLOCKED:")
 
 
 @dataclass
@@ -33,9 +101,14 @@ class Feature:
     spec: Optional[str] = None
     plan: Optional[str] = None
     tasks: Optional[str] = None
+    constitution: Optional[str] = None    # Feature-local overrides of the global constitution
     task_count: int = 0
     incomplete_tasks: int = 0
+    blocked_tasks: int = 0                # Incomplete tasks prefixed with BLOCKED:
     issues: List[str] = field(default_factory=list)
+    workspaces: List[Workspace] = field(default_factory=list)
+    tech_stack: str = "unknown"
+    backpressure_commands: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -43,6 +116,7 @@ class SpecKitProject:
     """Parsed Spec Kit project structure"""
     root: Path
     structure: str = "unknown"        # "flat" or "features"
+    feature_selection: Optional[str] = None
     constitution: Optional[str] = None
     
     # For flat structure
@@ -59,7 +133,9 @@ class SpecKitProject:
     total_incomplete: int = 0
     backpressure_commands: List[str] = field(default_factory=list)
     constraints: List[str] = field(default_factory=list)
+    constitution_index: Optional[ConstitutionIndex] = None
     tech_stack: str = "unknown"
+    workspaces: List[Workspace] = field(default_factory=list)
     issues: List[str] = field(default_factory=list)
 
 
@@ -99,12 +175,14 @@ def discover_features(specify_dir: Path) -> List[Feature]:
                 path=item,
                 spec=read_file_safe(item / "spec.md"),
                 plan=read_file_safe(item / "plan.md"),
-                tasks=read_file_safe(item / "tasks.md")
+                tasks=read_file_safe(item / "tasks.md"),
+                constitution=read_file_safe(item / "constitution.md")
             )
             
             # Analyze tasks
             if feature.tasks:
-                feature.task_count, feature.incomplete_tasks, issues = analyze_tasks(feature.tasks)
+                (feature.task_count, feature.incomplete_tasks,
+                 feature.blocked_tasks, issues) = analyze_tasks(feature.tasks)
                 feature.issues.extend(issues)
             
             # Check for missing files
@@ -172,17 +250,40 @@ def resolve_feature_selection(features: List[Feature], selection: Optional[str])
     return selected, errors
 
 
-def analyze_tasks(tasks_content: str) -> Tuple[int, int, List[str]]:
-    """Analyze tasks for count and potential issues"""
+TASK_LINE = re.compile(rb'^[ \t]*[-*] \[([ xX])\][ \t]*(.*?)\r?$')
+TASK_ID = re.compile(r'^(?:BLOCKED:\s*)?(T\d+)\b')
+
+
+def index_tasks(content: bytes) -> List[Task]:
+    """Index checkbox tasks by line number and byte offset"""
+    tasks = []
+    offset = 0
+    for line_no, line in enumerate(content.splitlines(keepends=True), 1):
+        match = TASK_LINE.match(line.rstrip(b'\n'))
+        if match:
+            text = match.group(2).decode('utf-8', errors='replace')
+            task_id = TASK_ID.match(text)
+            tasks.append(Task(
+                line=line_no,
+                offset=offset + match.start(1),
+                status=match.group(1).decode().lower(),
+                text=text,
+                id=task_id.group(1) if task_id else "",
+            ))
+        offset += len(line)
+    return tasks
+
+
+def analyze_tasks(tasks_content: str) -> Tuple[int, int, int, List[str]]:
+    """Analyze tasks for total, incomplete and blocked counts and potential issues"""
     if not tasks_content:
-        return 0, 0, ["No tasks content"]
+        return 0, 0, 0, ["No tasks content"]
     
     issues = []
     
     # Count checkboxes
-    incomplete = len(re.findall(r'- \[ \]', tasks_content))
-    complete = len(re.findall(r'- \[x\]', tasks_content, re.I))
-    total = incomplete + complete
+    tasks = index_tasks(tasks_content.encode('utf-8'))
+    total, incomplete, blocked = count_tasks(tasks)
     
     # If no checkboxes, count numbered items
     if total == 0:
@@ -191,43 +292,224 @@ def analyze_tasks(tasks_content: str) -> Tuple[int, int, List[str]]:
         incomplete = total
     
     # Check for large tasks
-    task_lines = re.findall(r'- \[ \]\s*(.+)', tasks_content)
-    for task in task_lines:
-        and_count = task.lower().count(' and ')
-        if and_count >= 2:
-            issues.append(f"Large task (multiple 'and'): {task[:60]}...")
+    for task in tasks:
+        if task.status == " " and task.text.lower().count(' and ') >= 2:
+            issues.append(f"Large task (multiple 'and'): {task.text[:60]}...")
     
-    return total, incomplete, issues
-
-
-def extract_constraints(constitution: str) -> List[str]:
-    """Extract non-negotiable constraints from constitution"""
+    return total, incomplete, blocked, issues
+
+
+def count_tasks(tasks: List[Task]) -> Tuple[int, int, int]:
+    """Return (total, incomplete, blocked) for indexed checkbox tasks"""
+    incomplete = [t for t in tasks if t.status == " "]
+    return len(tasks), len(incomplete), sum(1 for t in incomplete if t.blocked)
+
+
+# Explicit rule IDs: "[SEC-1] ...", "**R2:** ..." / "**R2**: ...", or bare "SEC-1: ...".
+# Leading words like "S3 buckets" or "V2 API" are rule text, not IDs.
+RULE_ID = re.compile(
+    r'^(?:\[(?P<bracket>[A-Z][A-Z0-9]*-?\d+)\]'
+    r'|\*\*(?P<bold>[A-Z][A-Z0-9]*-?\d+)(?::\*\*|\*\*:)'
+    r'|(?P<bare>[A-Z][A-Z0-9]*-\d+):)'
+    r'\s+(?P<text>.+)$'
+)
+SEVERITY_RANK = {"": 0, "may": 1, "should": 2, "must": 3}
+MUST_MARKERS = re.compile(r'\b(must|shall|never|always|required|mandatory|non-negotiable)\b', re.I)
+# Headings only promote their rules on an explicit marker, not on words like "Required Tools"
+SECTION_MUST_MARKERS = re.compile(r'\((?i:non-negotiable)\)|\bMUST\b')
+SHOULD_MARKERS = re.compile(r'\b(should|recommended|prefer|avoid)\b', re.I)
+MAY_MARKERS = re.compile(r'\b(MAY|OPTIONAL)\b')
+KEYWORD_STOPWORDS = {
+    "must", "shall", "should", "never", "always", "required", "mandatory", "recommended",
+    "prefer", "avoid", "optional", "with", "that", "this", "from", "into", "have", "when",
+    "each", "every", "only", "before", "after", "code", "uses", "using", "negotiable",
+}
+WORD = re.compile(r'[a-z][a-z0-9]{3,}')
+
+
+def rule_severity(text: str, default: str) -> str:
+    """Classify a rule by its RFC 2119-style markers"""
+    if MUST_MARKERS.search(text):
+        return "must"
+    if SHOULD_MARKERS.search(text):
+        return "should"
+    if MAY_MARKERS.search(text):
+        return "may"
+    return default
+
+
+def rule_keywords(text: str) -> List[str]:
+    """Words used to match a rule against a feature's spec and plan"""
+    return sorted(set(WORD.findall(text.lower())) - KEYWORD_STOPWORDS)
+
+
+def parse_constitution(constitution: str, source: str = "global") -> Tuple[List[str], List[Rule]]:
+    """Parse constitution text into section titles and rules"""
     if not constitution:
-        return []
+        return [], []
     
-    constraints = []
-    lines = constitution.split('\n')
+    sections: List[str] = []
+    rules: List[Rule] = []
+    seen = set()
+    section = ""
+    section_severity = ""
+    counters: Dict[str, int] = {}
     
-    for line in lines:
+    for line in constitution.split('\n'):
         line = line.strip()
         
+        heading = re.match(r'^#{1,6}\s+(.+?)\s*#*$', line)
+        if heading:
+            section = heading.group(1).strip()
+            sections.append(section)
+            # "### III. Test-First (NON-NEGOTIABLE)" applies to every rule below it
+            section_severity = "must" if SECTION_MUST_MARKERS.search(section) else ""
+            continue
+        
         # Extract bullet points and numbered items
         match = re.match(r'^[-*]\s+(.+)$', line) or re.match(r'^\d+\.\s+(.+)$', line)
-        if match:
-            content = match.group(1).strip().rstrip('.')
-            if content and len(content) > 10:
-                constraints.append(content)
+        if not match:
+            continue
+        content = match.group(1).strip().rstrip('.')
+        if not content or len(content) <= 10:
+            continue
+        
+        explicit = RULE_ID.match(content)
+        if explicit:
+            rule_id = explicit.group("bracket") or explicit.group("bold") or explicit.group("bare")
+            content = explicit.group("text").strip()
+        else:
+            # "### III. Test-First (NON-NEGOTIABLE)" -> "test-first"
+            title = re.sub(r'\(.*?\)', '', re.sub(r'^[IVXLC\d]+\.\s+', '', section))
+            slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-') or "rule"
+            counters[slug] = counters.get(slug, 0) + 1
+            rule_id = f"{slug}-{counters[slug]}"
+        
+        key = content.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        
+        rules.append(Rule(
+            id=rule_id,
+            text=content,
+            section=section,
+            # A MUST section outranks softer wording in its bullets
+            severity=max(section_severity, rule_severity(content, "should"), key=SEVERITY_RANK.get),
+            source=source,
+            explicit=bool(explicit),
+            keywords=rule_keywords(f"{section} {content}"),
+        ))
     
-    # Deduplicate
-    seen = set()
-    unique = []
-    for c in constraints:
-        key = c.lower()[:50]
-        if key not in seen:
-            seen.add(key)
-            unique.append(c)
+    return sections, rules
+
+
+def constitution_hash(constitution: str, features: List[Feature]) -> str:
+    """Hash every constitution source that feeds the compiled index"""
+    digest = hashlib.sha256(f"v{CONSTITUTION_INDEX_VERSION}\0".encode())
+    digest.update((constitution or "").encode('utf-8'))
+    for f in sorted(features, key=lambda f: f.id):
+        if f.constitution:
+            digest.update(f"\0{f.id}\0".encode('utf-8'))
+            digest.update(f.constitution.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_constitution_index(path: Path, expected_hash: str) -> Optional[ConstitutionIndex]:
+    """Load a compiled index if it exists and matches the current sources"""
+    content = read_file_safe(path)
+    if not content:
+        return None
+    try:
+        data = json.loads(content)
+        if data.get("hash") != expected_hash:
+            return None
+        return ConstitutionIndex(
+            hash=data["hash"],
+            sections=data.get("sections", []),
+            rules=[Rule(**r) for r in data.get("rules", [])],
+            overrides={fid: [Rule(**r) for r in rules] for fid, rules in data.get("overrides", {}).items()},
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def compile_constitution(specify_dir: Path, constitution: str, features: List[Feature]) -> ConstitutionIndex:
+    """Compile constitution.md and feature-local constitutions into a cached index"""
+    index_path = specify_dir / CONSTITUTION_INDEX_FILENAME
+    expected_hash = constitution_hash(constitution, features)
+    
+    index = load_constitution_index(index_path, expected_hash)
+    if index is not None:
+        return index
+    
+    sections, rules = parse_constitution(constitution)
+    index = ConstitutionIndex(hash=expected_hash, sections=sections, rules=rules)
+    for f in features:
+        if f.constitution:
+            _, feature_rules = parse_constitution(f.constitution, source=f.id)
+            if feature_rules:
+                index.overrides[f.id] = feature_rules
     
-    return unique[:15]
+    try:
+        index_path.write_text(json.dumps(asdict(index), indent=2), encoding='utf-8')
+        ensure_gitignored(specify_dir, CONSTITUTION_INDEX_FILENAME)
+    except OSError:
+        pass  # Read-only checkout: compile again next run
+    return index
+
+
+def ensure_gitignored(directory: Path, filename: str) -> None:
+    """Add filename to directory/.gitignore so generated caches stay out of `git add -A`"""
+    gitignore = directory / ".gitignore"
+    content = read_file_safe(gitignore) or ""
+    if filename in (line.strip().lstrip("/") for line in content.splitlines()):
+        return
+    if content and not content.endswith("\n"):
+        content += "\n"
+    gitignore.write_text(f"{content}/{filename}\n", encoding='utf-8')
+
+
+def select_rules(index: ConstitutionIndex, feature_id: Optional[str], context: str) -> Tuple[List[Rule], int]:
+    """Pick the rules relevant to a feature: all MUST rules, its own overrides, and
+    lower-severity rules whose keywords appear in its spec/plan.
+
+    Returns the selected rules and the number omitted.
+    """
+    overrides = {r.id: r for r in index.overrides.get(feature_id, [])} if feature_id else {}
+    # Feature rules with a matching explicit ID replace the global rule in place
+    rules = [overrides.pop(r.id) if r.explicit and r.id in overrides else r for r in index.rules]
+    rules += list(overrides.values())
+    
+    words = set(WORD.findall(context.lower()))
+    selected = [
+        r for r in rules
+        if r.severity == "must" or r.source != "global" or not words or words.intersection(r.keywords)
+    ]
+    return selected, len(rules) - len(selected)
+
+
+def format_rules(rules: List[Rule]) -> str:
+    """Render rules as a markdown list"""
+    return "\n".join(f"- [{r.id}] {r.text}" if r.explicit else f"- {r.text}" for r in rules)
+
+
+def format_constraints(project: SpecKitProject, feature: Optional[Feature] = None,
+                       context: Optional[str] = None) -> str:
+    """Constraints section for a prompt, selected from the compiled constitution index"""
+    index = project.constitution_index
+    if index is None or not (index.rules or index.overrides):
+        return "- Follow all guidelines in constitution.md"
+    
+    if context is None:
+        source = feature if feature is not None else project
+        context = f"{source.spec or ''}\n{source.plan or ''}"
+    rules, omitted = select_rules(index, feature.id if feature else None, context)
+    
+    text = format_rules(rules) or "- Follow all guidelines in constitution.md"
+    if omitted:
+        text += f"\n\n_{omitted} lower-severity rules not relevant here are omitted; see constitution.md._"
+    return text
 
 
 def detect_tech_stack(plan: str, constitution: str) -> Tuple[str, List[str]]:
@@ -283,6 +565,228 @@ def detect_tech_stack(plan: str, constitution: str) -> Tuple[str, List[str]]:
     return stack, list(dict.fromkeys(commands))
 
 
+# Manifests that mark a package directory, checked by name only (stat, no content scan)
+MANIFESTS = {
+    "package.json": "node",
+    "pyproject.toml": "python",
+    "Cargo.toml": "rust",
+    "go.mod": "go",
+}
+
+# Directories never descended into when looking for nested packages
+SKIP_DIRS = {
+    "node_modules", ".git", ".hg", ".svn", ".specify", ".venv", "venv", "env",
+    "__pycache__", "target", "dist", "build", "vendor", ".next", ".tox", ".nox",
+}
+
+MAX_WORKSPACE_DEPTH = 4
+
+
+def read_manifest_name(manifest: Path, stack: str) -> str:
+    """Read the package name from a manifest with cheap, format-specific parsing"""
+    content = read_file_safe(manifest)
+    if not content:
+        return ""
+    
+    if stack == "node":
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return ""
+        return data.get("name", "") if isinstance(data, dict) else ""
+    
+    if stack == "go":
+        match = re.search(r'^module\s+(\S+)', content, re.MULTILINE)
+        return match.group(1) if match else ""
+    
+    # TOML: first `name = "..."` inside [project], [tool.poetry] or [package]
+    section = ""
+    for line in content.splitlines():
+        line = line.strip()
+        if line.startswith('['):
+            section = line.strip('[] ')
+            continue
+        if section in ("project", "tool.poetry", "package"):
+            match = re.match(r'^name\s*=\s*["\']([^"\']+)["\']', line)
+            if match:
+                return match.group(1)
+    return ""
+
+
+def root_workspace_globs(root: Path) -> Tuple[List[str], List[str]]:
+    """Read member globs from root package.json workspaces and Cargo.toml [workspace]"""
+    npm_globs: List[str] = []
+    cargo_globs: List[str] = []
+    
+    package_json = read_file_safe(root / "package.json")
+    if package_json:
+        try:
+            data = json.loads(package_json)
+        except ValueError:
+            data = {}
+        workspaces = data.get("workspaces", []) if isinstance(data, dict) else []
+        if isinstance(workspaces, dict):
+            # Yarn classic form: {"packages": [...], "nohoist": [...]}
+            workspaces = workspaces.get("packages", [])
+        npm_globs = [w.removeprefix("./").rstrip("/") for w in workspaces if isinstance(w, str)]
+    
+    cargo_toml = read_file_safe(root / "Cargo.toml")
+    if cargo_toml:
+        cargo_globs = [m.removeprefix("./").rstrip("/") for m in read_cargo_members(cargo_toml)]
+    
+    return npm_globs, cargo_globs
+
+
+def read_cargo_members(cargo_toml: str) -> List[str]:
+    """Read `members = [...]` from the [workspace] section, which may span lines"""
+    section = ""
+    members: Optional[str] = None
+    for line in cargo_toml.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if members is not None:
+            members += " " + line
+        elif line.startswith('['):
+            section = line.strip('[] ')
+            continue
+        elif section == "workspace" and re.match(r'^members\s*=', line):
+            members = line.split('=', 1)[1]
+        
+        if members is not None and ']' in members:
+            return re.findall(r'["\']([^"\']+)["\']', members.split(']', 1)[0])
+    return []
+
+
+def match_workspace_glob(rel: str, pattern: str) -> bool:
+    """Match a relative path against a workspace glob one path segment at a time.
+
+    `*` never crosses a `/`; only an explicit `**` segment spans directories.
+    """
+    def match(parts: List[str], globs: List[str]) -> bool:
+        if not globs:
+            return not parts
+        if globs[0] == "**":
+            return any(match(parts[i:], globs[1:]) for i in range(len(parts) + 1))
+        return bool(parts) and fnmatch.fnmatchcase(parts[0], globs[0]) and match(parts[1:], globs[1:])
+    
+    return match(rel.split("/"), [g for g in pattern.split("/") if g not in ("", ".")])
+
+
+def discover_workspaces(root: Path) -> List[Workspace]:
+    """Discover packages from manifests on disk (root and nested)"""
+    npm_globs, cargo_globs = root_workspace_globs(root)
+    workspaces = []
+    
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        depth = 0 if rel == "." else rel.count("/") + 1
+        
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if d not in SKIP_DIRS and not d.startswith('.') and depth < MAX_WORKSPACE_DEPTH
+        )
+        
+        for manifest, stack in MANIFESTS.items():
+            if manifest not in filenames:
+                continue
+            
+            # Root aggregators only declare members; they are not packages themselves
+            if rel == ".":
+                if stack == "node" and npm_globs:
+                    continue
+                if stack == "rust" and cargo_globs and not read_manifest_name(root / manifest, stack):
+                    continue
+            
+            globs = npm_globs if stack == "node" else cargo_globs if stack == "rust" else []
+            workspaces.append(Workspace(
+                path=rel,
+                stack=stack,
+                name=read_manifest_name(Path(dirpath) / manifest, stack),
+                member=rel != "." and any(match_workspace_glob(rel, g) for g in globs),
+                typescript=stack == "node" and "tsconfig.json" in filenames,
+            ))
+    
+    return workspaces
+
+
+def match_workspaces(plan: str, workspaces: List[Workspace]) -> List[Workspace]:
+    """Find workspaces a plan references by relative path or package name"""
+    if not plan:
+        return []
+    
+    text = plan.lower()
+    matched = []
+    for ws in workspaces:
+        if ws.path == ".":
+            continue
+        
+        path_ref = re.search(r'(?<![\w.-])(?:\./)?' + re.escape(ws.path.lower()) + r'(?![\w-])', text)
+        name = ws.name.lower()
+        # Bare names like "api" are too common in prose; require backticks unless scoped/hyphenated
+        name_ref = bool(name) and (
+            f"`{name}`" in text or
+            (any(c in name for c in "@/-_") and
+             re.search(r'(?<![\w@/.-])' + re.escape(name) + r'(?![\w-])', text) is not None)
+        )
+        if path_ref or name_ref:
+            matched.append(ws)
+    
+    return matched
+
+
+def workspace_commands(ws: Workspace) -> List[str]:
+    """Backpressure commands limited to a single workspace"""
+    path = shlex.quote(ws.path)
+    
+    if ws.stack == "node":
+        scripts = ["test", "run lint"] + (["run build"] if ws.typescript else [])
+        if ws.member:
+            return [f"npm {script} --workspace={path}" for script in scripts]
+        return [f"npm --prefix {path} {script}" for script in scripts]
+    
+    if ws.stack == "python":
+        return [f"pytest {path}", f"ruff check {path}"]
+    
+    if ws.stack == "rust":
+        if ws.member and ws.name:
+            name = shlex.quote(ws.name)
+            return [f"cargo test -p {name}", f"cargo clippy -p {name}", f"cargo build -p {name}"]
+        manifest = shlex.quote(f"{ws.path}/Cargo.toml")
+        return [f"cargo test --manifest-path {manifest}", f"cargo clippy --manifest-path {manifest}",
+                f"cargo build --manifest-path {manifest}"]
+    
+    if ws.stack == "go":
+        return [f"(cd {path} && go test ./...)", f"(cd {path} && go vet ./...)"]
+    
+    return []
+
+
+def resolve_feature_backpressure(feature: Feature, workspaces: List[Workspace], constitution: str) -> None:
+    """Set a feature's stack and backpressure commands, scoped to its referenced workspaces"""
+    feature.workspaces = match_workspaces(feature.plan or "", workspaces)
+    
+    if feature.workspaces:
+        feature.tech_stack = "+".join(dict.fromkeys(ws.stack for ws in feature.workspaces))
+        feature.backpressure_commands = list(dict.fromkeys(
+            cmd for ws in feature.workspaces for cmd in workspace_commands(ws)
+        ))
+    else:
+        # No package references: fall back to repo-wide detection from this feature's plan
+        feature.tech_stack, feature.backpressure_commands = detect_tech_stack(
+            feature.plan or "", constitution
+        )
+
+
+def format_backpressure(commands: List[str]) -> str:
+    """Indent backpressure commands for a prompt code block"""
+    return "\n".join(f"   {cmd}" for cmd in commands)
+
+
+def mark_command(status: str, feature_id: Optional[str] = None) -> str:
+    """Command the agent runs to update a task's checkbox in place"""
+    feature_arg = f" --feature {feature_id}" if feature_id else ""
+    return f'python3 "{SCRIPT_PATH}" mark [task-id] --{status}{feature_arg}'
+
+
 def calculate_iterations(incomplete_tasks: int, num_features: int = 1, buffer: float = 0.2) -> int:
     """Calculate recommended max iterations"""
     base = incomplete_tasks * 4
@@ -297,8 +801,8 @@ def generate_prompt_flat(project: SpecKitProject) -> str:
     """Generate prompt for flat structure"""
     project_name = project.root.name or "Project"
     
-    constraints_text = "\n".join(f"- {c}" for c in project.constraints[:10]) if project.constraints else "- Follow all guidelines in constitution.md"
-    backpressure_text = "\n".join(f"   {cmd}" for cmd in project.backpressure_commands)
+    constraints_text = format_constraints(project)
+    backpressure_text = format_backpressure(project.backpressure_commands)
     
     return f'''# Ralph Loop: {project_name}
 
@@ -328,7 +832,9 @@ Complete all tasks in `.specify/tasks.md` systematically until done.
 {backpressure_text}
 ```
 
-5. **Mark Complete**: Change `- [ ]` to `- [x]` for this task in tasks.md
+5. **Mark Complete**: Run `{mark_command("done")}`
+   - `[task-id]` is the task's ID (e.g. `T012`) or its line number in tasks.md
+   - Do not edit tasks.md by hand to check tasks off
 
 6. **Commit**: `git add -A && git commit -m "feat: [task description]"`
 
@@ -349,7 +855,7 @@ Unable to progress after 10 iterations:
 ## If Stuck
 
 After 5 attempts on one task:
-1. Add `BLOCKED:` prefix to the task
+1. Mark the task blocked: `{mark_command("blocked")}`
 2. Document what you tried
 3. Move to the next task
 '''
@@ -359,8 +865,10 @@ def generate_prompt_single_feature(project: SpecKitProject, feature: Feature) ->
     """Generate prompt for single feature"""
     project_name = project.root.name or "Project"
     
-    constraints_text = "\n".join(f"- {c}" for c in project.constraints[:10]) if project.constraints else "- Follow all guidelines in constitution.md"
-    backpressure_text = "\n".join(f"   {cmd}" for cmd in project.backpressure_commands)
+    constraints_text = format_constraints(project, feature)
+    backpressure_text = format_backpressure(feature.backpressure_commands or project.backpressure_commands)
+    override_text = (f"\n- `@.specify/features/{feature.id}/constitution.md` - Feature rules (override global rules with the same ID)"
+                     if feature.constitution else "")
     
     return f'''# Ralph Loop: {project_name} - Feature {feature.id}
 
@@ -369,7 +877,7 @@ def generate_prompt_single_feature(project: SpecKitProject, feature: Feature) ->
 Before starting, read these files:
 - `@.specify/constitution.md` - Global rules (apply to all features)
 - `@.specify/features/{feature.id}/spec.md` - This feature's specification
-- `@.specify/features/{feature.id}/plan.md` - This feature's technical plan
+- `@.specify/features/{feature.id}/plan.md` - This feature's technical plan{override_text}
 
 ## Your Mission
 
@@ -392,7 +900,9 @@ Current status: {feature.incomplete_tasks} tasks remaining
 {backpressure_text}
 ```
 
-5. **Mark Complete**: Change `- [ ]` to `- [x]` for this task
+5. **Mark Complete**: Run `{mark_command("done", feature.id)}`
+   - `[task-id]` is the task's ID (e.g. `T012`) or its line number in tasks.md
+   - Do not edit tasks.md by hand to check tasks off
 
 6. **Commit**: `git add -A && git commit -m "feat({feature.name}): [task description]"`
 
@@ -413,44 +923,98 @@ Unable to progress after 10 iterations:
 ## If Stuck
 
 After 5 attempts on one task:
-1. Add `BLOCKED:` prefix to the task
+1. Mark the task blocked: `{mark_command("blocked", feature.id)}`
 2. Document what you tried
 3. Move to the next task
 '''
 
 
-def generate_prompt_multi_feature(project: SpecKitProject) -> str:
-    """Generate prompt for multiple features"""
-    project_name = project.root.name or "Project"
-    features = project.selected_features
-    
-    constraints_text = "\n".join(f"- {c}" for c in project.constraints[:10]) if project.constraints else "- Follow all guidelines in constitution.md"
-    backpressure_text = "\n".join(f"   {cmd}" for cmd in project.backpressure_commands)
-    
-    # Build feature list
-    feature_list = []
-    for i, f in enumerate(features, 1):
-        feature_list.append(f"{i}. `{f.id}` ({f.incomplete_tasks} tasks)")
-    feature_list_text = "\n".join(feature_list)
-    
-    # Build context list
-    context_list = ["- `@.specify/constitution.md` - Global rules (apply to all features)"]
-    for f in features:
-        context_list.append(f"- `@.specify/features/{f.id}/` - spec.md, plan.md, tasks.md")
-    context_text = "\n".join(context_list)
-    
-    return f'''# Ralph Loop: {project_name} - Multiple Features
+def current_page(features: List[Feature], page_size: int) -> Tuple[int, int]:
+    """Return (0-based page index, page count) of the first page with workable tasks.
 
-## Features to Complete (in order)
+    Blocked tasks count as settled so a window of done/blocked features still advances.
+    """
+    page_count = max((len(features) + page_size - 1) // page_size, 1)
+    first_open = next(
+        (i for i, f in enumerate(features) if f.incomplete_tasks > f.blocked_tasks), len(features) - 1
+    )
+    return min(max(first_open, 0) // page_size, page_count - 1), page_count
 
-{feature_list_text}
 
-Total: {project.total_incomplete} tasks across {len(features)} features
+def advance_command(project: SpecKitProject, page_size: int) -> str:
+    """Command the agent runs to regenerate PROMPT.md for the next feature window"""
+    selection = shlex.quote(project.feature_selection or "all")
+    return f'python3 "{SCRIPT_PATH}" --feature {selection} --page-size {page_size}'
 
-## Context
 
-{context_text}
+def render_prompt_multi_feature(project: SpecKitProject, page_size: int = 0) -> Iterator[str]:
+    """Stream the prompt for multiple features.
 
+    With page_size > 0 only the current window of features is inlined; the full
+    list goes to the index file (see render_feature_index).
+    """
+    project_name = project.root.name or "Project"
+    features = project.selected_features
+    
+    if page_size > 0:
+        page, page_count = current_page(features, page_size)
+        offset = page * page_size
+        window = features[offset:offset + page_size]
+    else:
+        page, page_count, offset, window = 0, 1, 0, features
+    paged = page_size > 0
+    last_page = page == page_count - 1
+    
+    # Global rules relevant to any feature in the window; feature-local rules listed separately
+    window_context = "\n".join(f"{f.spec or ''}\n{f.plan or ''}" for f in window)
+    constraints_text = format_constraints(project, context=window_context)
+    index = project.constitution_index
+    feature_rules = [(f, index.overrides[f.id]) for f in window if index and f.id in index.overrides]
+    if feature_rules:
+        constraints_text += "\n\n### Feature-Specific Rules\n\nThese override global rules with the same ID.\n"
+        for f, rules in feature_rules:
+            constraints_text += f"\n**{f.id}**\n{format_rules(rules)}\n"
+        constraints_text = constraints_text.rstrip("\n")
+    
+    # Per-feature backpressure only when features are scoped differently
+    scoped = len({tuple(f.backpressure_commands) for f in window}) > 1
+    if scoped:
+        verify_text = "Run the current feature's feedback loops (see Backpressure by Feature) - every one must pass"
+    else:
+        commands = window[0].backpressure_commands if window else project.backpressure_commands
+        verify_text = f"Run ALL feedback loops - every one must pass:\n```bash\n{format_backpressure(commands)}\n```"
+    
+    yield f"# Ralph Loop: {project_name} - Multiple Features\n\n"
+    
+    if paged:
+        yield f"## Current Window (page {page + 1} of {page_count})\n\n"
+    else:
+        yield "## Features to Complete (in order)\n\n"
+    for i, f in enumerate(window, offset + 1):
+        yield f"{i}. `{f.id}` ({f.incomplete_tasks} tasks)\n"
+    yield f"\nTotal: {project.total_incomplete} tasks across {len(features)} features\n"
+    if paged:
+        yield (f"\nCursor: features {offset + 1}-{offset + len(window)} of {len(features)}. "
+               f"The full list is in `{INDEX_FILENAME}`; only the window above is in scope.\n")
+    
+    yield "\n## Context\n\n"
+    yield "- `@.specify/constitution.md` - Global rules (apply to all features)\n"
+    for f in window:
+        yield f"- `@.specify/features/{f.id}/` - spec.md, plan.md, tasks.md\n"
+    
+    if paged and not last_page:
+        continue_text = f'''   - If feature complete → move to next feature in this window
+   - If every feature in this window is complete, or its remaining tasks are all BLOCKED →
+     run `{advance_command(project, page_size)}`
+     to move the window, then commit PROMPT.md and {INDEX_FILENAME} and continue
+   - If all features complete → output completion signal'''
+    else:
+        continue_text = '''   - If feature complete → move to next feature
+   - If all features complete → output completion signal'''
+    all_complete = (f"All features in {INDEX_FILENAME} complete (not just this window)"
+                    if paged and not last_page else "All features complete")
+    
+    yield f'''
 ## Your Mission
 
 Complete all features in the order listed above. For each feature:
@@ -460,35 +1024,40 @@ Complete all features in the order listed above. For each feature:
 
 ## Process (Every Iteration)
 
-1. **Identify Current Feature**: Find the first feature with incomplete tasks
+1. **Identify Current Feature**: Find the first feature with incomplete tasks that are not BLOCKED
 
-2. **Read Tasks**: Check that feature's tasks.md for the next `- [ ]` task
+2. **Read Tasks**: Check that feature's tasks.md for the next `- [ ]` task (skip `BLOCKED:` tasks)
 
 3. **Search First**: Before implementing, search the codebase
 
 4. **Implement**: Make the minimal changes needed for this ONE task
 
-5. **Verify**: Run ALL feedback loops - every one must pass:
-```bash
-{backpressure_text}
-```
+5. **Verify**: {verify_text}
 
-6. **Mark Complete**: Change `- [ ]` to `- [x]` for this task
+6. **Mark Complete**: Run `{mark_command("done", "[feature-id]")}`
+   - `[task-id]` is the task's ID (e.g. `T012`) or its line number in that feature's tasks.md
+   - Do not edit tasks.md by hand to check tasks off
 
 7. **Commit**: `git add -A && git commit -m "feat([feature-name]): [task description]"`
 
 8. **Continue**: 
    - If more tasks in current feature → next task
-   - If feature complete → move to next feature
-   - If all features complete → output completion signal
+{continue_text}
 
-## Constraints (Non-Negotiable)
+'''
+    
+    if scoped:
+        yield "## Backpressure by Feature\n\n"
+        for f in window:
+            yield f"### {f.id}\n```bash\n{format_backpressure(f.backpressure_commands)}\n```\n\n"
+    
+    yield f'''## Constraints (Non-Negotiable)
 
 {constraints_text}
 
 ## Completion Signals
 
-All features complete + tests pass:
+{all_complete} + tests pass:
 <promise>ALL_TASKS_COMPLETE</promise>
 
 Single feature complete (for progress tracking):
@@ -500,18 +1069,54 @@ Unable to progress after 10 iterations:
 ## If Stuck
 
 After 5 attempts on one task:
-1. Add `BLOCKED:` prefix to the task
+1. Mark the task blocked: `{mark_command("blocked", "[feature-id]")}`
 2. Document what you tried
 3. Move to the next task (same or next feature)
 '''
 
 
-def generate_config(project: SpecKitProject, max_iterations: int) -> str:
+def generate_prompt_multi_feature(project: SpecKitProject, page_size: int = 0) -> str:
+    """Generate prompt for multiple features"""
+    return "".join(render_prompt_multi_feature(project, page_size))
+
+
+def render_feature_index(project: SpecKitProject, page_size: int) -> Iterator[str]:
+    """Stream the feature index that backs a paged multi-feature prompt"""
+    features = project.selected_features
+    page, page_count = current_page(features, page_size)
+    
+    yield f"# Ralph Feature Index: {project.root.name or 'Project'}\n\n"
+    yield f"{len(features)} features, {project.total_incomplete} tasks remaining. "
+    yield f"Current window: page {page + 1} of {page_count}.\n"
+    
+    for i, f in enumerate(features):
+        if i % page_size == 0:
+            marker = " (current)" if i // page_size == page else ""
+            last = min(i + page_size, len(features))
+            yield f"\n## Page {i // page_size + 1}: features {i + 1}-{last}{marker}\n\n"
+        check = "x" if f.incomplete_tasks == 0 else " "
+        blocked = f" ({f.blocked_tasks} blocked)" if f.blocked_tasks else ""
+        yield (f"- [{check}] `{f.id}` - {f.incomplete_tasks}/{f.task_count} tasks remaining{blocked}"
+               f" - `.specify/features/{f.id}/`\n")
+
+
+def write_stream(path: Path, chunks: Iterable[str]) -> None:
+    """Write chunks to path as they are produced"""
+    with open(path, "w", encoding="utf-8") as fh:
+        for chunk in chunks:
+            fh.write(chunk)
+
+
+def generate_config(project: SpecKitProject, max_iterations: int, page_size: int = 0) -> str:
     """Generate ralph-config.md"""
     
-    if project.structure == "features" and project.selected_features:
+    if page_size:
+        scope_info = (f"Features included: {len(project.selected_features)} "
+                      f"({page_size} per PROMPT.md window, full list in {INDEX_FILENAME})")
+    elif project.structure == "features" and project.selected_features:
         feature_info = "\n".join(
             f"  - {f.id}: {f.incomplete_tasks} tasks"
+            + (f" ({', '.join(ws.path for ws in f.workspaces)})" if f.workspaces else "")
             for f in project.selected_features
         )
         scope_info = f"Features included:\n{feature_info}"
@@ -562,7 +1167,7 @@ git reset --hard HEAD~1    # Revert last commit
 
 def analyze_project(project_path: Path, feature_selection: Optional[str] = None) -> SpecKitProject:
     """Full project analysis"""
-    project = SpecKitProject(root=project_path)
+    project = SpecKitProject(root=project_path, feature_selection=feature_selection)
     specify_dir = project_path / ".specify"
     
     if not specify_dir.exists():
@@ -593,16 +1198,22 @@ def analyze_project(project_path: Path, feature_selection: Optional[str] = None)
             project.total_incomplete += f.incomplete_tasks
             project.issues.extend([f"[{f.id}] {issue}" for issue in f.issues])
         
-        # Get plan content for tech detection (from first feature with plan)
-        plan_content = ""
+        # Scope backpressure per feature to the packages its plan references
+        project.workspaces = discover_workspaces(project_path)
         for f in selected:
-            if f.plan:
-                plan_content = f.plan
-                break
+            resolve_feature_backpressure(f, project.workspaces, project.constitution or "")
         
-        project.tech_stack, project.backpressure_commands = detect_tech_stack(
-            plan_content, project.constitution or ""
-        )
+        if selected:
+            # Feature stacks may already be combined ("node+python")
+            stacks = [stack for f in selected for stack in f.tech_stack.split("+") if stack != "unknown"]
+            project.tech_stack = "+".join(dict.fromkeys(stacks)) or "unknown"
+            project.backpressure_commands = list(dict.fromkeys(
+                cmd for f in selected for cmd in f.backpressure_commands
+            ))
+        else:
+            project.tech_stack, project.backpressure_commands = detect_tech_stack(
+                "", project.constitution or ""
+            )
     
     elif flat_tasks.exists():
         project.structure = "flat"
@@ -611,7 +1222,7 @@ def analyze_project(project_path: Path, feature_selection: Optional[str] = None)
         project.tasks = read_file_safe(flat_tasks)
         
         if project.tasks:
-            project.total_tasks, project.total_incomplete, issues = analyze_tasks(project.tasks)
+            project.total_tasks, project.total_incomplete, _, issues = analyze_tasks(project.tasks)
             project.issues.extend(issues)
         else:
             project.issues.append("tasks.md is empty")
@@ -623,14 +1234,182 @@ def analyze_project(project_path: Path, feature_selection: Optional[str] = None)
     else:
         project.issues.append("No tasks.md or features/ found in .specify/")
     
-    # Extract constraints
-    if project.constitution:
-        project.constraints = extract_constraints(project.constitution)
+    # Compile constitution (global + feature-local overrides) once; reused while unchanged
+    if project.constitution or any(f.constitution for f in project.features):
+        project.constitution_index = compile_constitution(
+            specify_dir, project.constitution or "", project.features
+        )
+        project.constraints = [r.text for r in project.constitution_index.rules]
     
     return project
 
 
+def find_task(tasks: List[Task], selector: str) -> Optional[Task]:
+    """Find a task by Spec Kit ID (e.g. T012) or 1-based line number"""
+    if selector.isdigit():
+        line = int(selector)
+        return next((t for t in tasks if t.line == line), None)
+    selector = selector.upper()
+    return next((t for t in tasks if t.id.upper() == selector), None)
+
+
+def resolve_tasks_files(project_path: Path, feature_selection: Optional[str]) -> Tuple[List[Path], List[str]]:
+    """Resolve the tasks.md file(s) a mark command may patch"""
+    specify_dir = project_path / ".specify"
+    features_dir = specify_dir / "features"
+    
+    if features_dir.exists() and any(features_dir.iterdir()):
+        features = discover_features(specify_dir)
+        if feature_selection:
+            selected, errors = resolve_feature_selection(features, feature_selection)
+        else:
+            # A task ID may be looked up across every feature
+            selected, errors = features, []
+        return [f.path / "tasks.md" for f in selected if f.tasks is not None], errors
+    
+    flat_tasks = specify_dir / "tasks.md"
+    if flat_tasks.exists():
+        return [flat_tasks], []
+    return [], ["No tasks.md or features/ found in .specify/"]
+
+
+def patch_task(content: bytes, task: Task, blocked: bool) -> bytes:
+    """Return content with one task's status patched; other bytes are left untouched"""
+    if content[task.offset:task.offset + 1].lower() not in (b" ", b"x"):
+        raise ValueError(f"tasks.md changed since it was indexed (line {task.line})")
+    
+    text_start = task.offset + 2
+    while content[text_start:text_start + 1] in (b" ", b"\t"):
+        text_start += 1
+    
+    if not blocked:
+        checked = content[:task.offset] + b"x" + content[task.offset + 1:text_start]
+        if task.blocked:
+            # Finishing a blocked task clears the block: "- [x] T003 Do thing"
+            text_start += len(b"BLOCKED:")
+            while content[text_start:text_start + 1] in (b" ", b"\t"):
+                text_start += 1
+        return checked + content[text_start:]
+    
+    if task.status == "x":
+        raise ValueError(f"Task on line {task.line} is already done; cannot mark it blocked")
+    if task.blocked:
+        return content
+    # "- [ ] T003 Do thing" -> "- [ ] BLOCKED: T003 Do thing"
+    return content[:text_start] + b"BLOCKED: " + content[text_start:]
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Write content to path via a temp file in the same directory and os.replace"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(content)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def mark_task(tasks_files: List[Path], selector: str, blocked: bool) -> Tuple[Path, Task, bool]:
+    """Locate a task across tasks files and patch its status in place.
+
+    Returns the patched file, the task as indexed, and whether the file changed.
+    """
+    if selector.isdigit() and len(tasks_files) > 1:
+        raise ValueError("Line numbers are ambiguous across features; pass --feature")
+    
+    # Spec Kit task IDs restart at T001 in every feature, so require a unique match
+    matches = [path for path in tasks_files if find_task(index_tasks(path.read_bytes()), selector)]
+    if not matches:
+        raise LookupError(f"Task not found: '{selector}'")
+    if len(matches) > 1:
+        features = ", ".join(path.parent.name for path in matches)
+        raise ValueError(f"Task '{selector}' exists in several features ({features}); pass --feature")
+    path = matches[0]
+    
+    # Lock the feature directory: os.replace swaps the inode of tasks.md itself,
+    # and a sidecar lock file would end up in the agent's commits
+    lock_fd = os.open(path.parent, os.O_RDONLY) if fcntl is not None else None
+    try:
+        if lock_fd is not None:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        # Re-index under the lock in case the file changed since the lookup
+        content = path.read_bytes()
+        task = find_task(index_tasks(content), selector)
+        if task is None:
+            raise LookupError(f"Task not found: '{selector}'")
+        
+        patched = patch_task(content, task, blocked)
+        if patched != content:
+            write_atomic(path, patched)
+        return path, task, patched != content
+    finally:
+        if lock_fd is not None:
+            os.close(lock_fd)
+
+
+def mark_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="generate_ralph_prompt.py mark",
+        description="Mark a task done or blocked in tasks.md without rewriting the file"
+    )
+    parser.add_argument("task", help="Task ID (e.g. T012) or 1-based line number in tasks.md")
+    parser.add_argument("project_path", type=Path, nargs="?", default=Path("."),
+                        help="Path to project root (default: current directory)")
+    status = parser.add_mutually_exclusive_group(required=True)
+    status.add_argument("--done", action="store_true", help="Check the task off ([x])")
+    status.add_argument("--blocked", action="store_true", help="Prefix the task with BLOCKED:")
+    parser.add_argument("--feature", type=str, default=None,
+                        help="Feature containing the task (required for line numbers)")
+    parser.add_argument("--json", action="store_true",
+                        help="Output as JSON")
+    
+    args = parser.parse_args(argv)
+    project_path = args.project_path.resolve()
+    
+    tasks_files, errors = resolve_tasks_files(project_path, args.feature)
+    if errors or not tasks_files:
+        for error in errors or ["No tasks.md found"]:
+            print(f"Error: {error}", file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        path, task, changed = mark_task(tasks_files, args.task, args.blocked)
+    except (LookupError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    total, incomplete, _ = count_tasks(index_tasks(path.read_bytes()))
+    state = "blocked" if args.blocked else "done"
+    
+    if args.json:
+        print(json.dumps({
+            "success": True,
+            "file": str(path),
+            "task": {"id": task.id, "line": task.line, "text": task.text},
+            "status": state,
+            "changed": changed,
+            "total_tasks": total,
+            "incomplete_tasks": incomplete
+        }, indent=2))
+    else:
+        label = task.id or f"line {task.line}"
+        note = "" if changed else " (already)"
+        print(f"✅ Marked {label} {state}{note}: {path.relative_to(project_path)}")
+        print(f"   Tasks: {incomplete} incomplete / {total} total")
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "mark":
+        mark_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
         description="Generate Ralph prompts from Spec Kit projects"
     )
@@ -640,6 +1419,9 @@ def main():
                         help="Feature selection: 'all', single ID, or comma-separated list")
     parser.add_argument("--max-iterations", type=int, default=None,
                         help="Override max iterations")
+    parser.add_argument("--page-size", type=int, default=None,
+                        help=f"Features per PROMPT.md window for multi-feature runs; 0 disables paging "
+                             f"(default: {DEFAULT_PAGE_SIZE} above {PAGING_THRESHOLD} features)")
     parser.add_argument("--json", action="store_true",
                         help="Output as JSON")
     
@@ -664,22 +1446,33 @@ def main():
     num_features = len(project.selected_features) if project.structure == "features" else 1
     max_iter = args.max_iterations or calculate_iterations(project.total_incomplete, num_features)
     
+    # Page large multi-feature runs so PROMPT.md stays a constant size
+    page_size = 0
+    if project.structure == "features" and len(project.selected_features) > 1:
+        if args.page_size is not None:
+            page_size = max(args.page_size, 0)
+        elif len(project.selected_features) > PAGING_THRESHOLD:
+            page_size = DEFAULT_PAGE_SIZE
+    
     # Generate prompt based on structure
     if project.structure == "flat":
-        prompt_content = generate_prompt_flat(project)
+        prompt_chunks = [generate_prompt_flat(project)]
     elif len(project.selected_features) == 1:
-        prompt_content = generate_prompt_single_feature(project, project.selected_features[0])
+        prompt_chunks = [generate_prompt_single_feature(project, project.selected_features[0])]
     else:
-        prompt_content = generate_prompt_multi_feature(project)
+        prompt_chunks = render_prompt_multi_feature(project, page_size)
     
-    config_content = generate_config(project, max_iter)
+    config_content = generate_config(project, max_iter, page_size)
     
     # Write files
     prompt_path = project_path / "PROMPT.md"
     config_path = project_path / "ralph-config.md"
+    index_path = project_path / INDEX_FILENAME
     
-    prompt_path.write_text(prompt_content, encoding='utf-8')
+    write_stream(prompt_path, prompt_chunks)
     config_path.write_text(config_content, encoding='utf-8')
+    if page_size:
+        write_stream(index_path, render_feature_index(project, page_size))
     
     if args.json:
         result = {
@@ -687,10 +1480,18 @@ def main():
             "structure": project.structure,
             "files": {
                 "prompt": str(prompt_path),
-                "config": str(config_path)
+                "config": str(config_path),
+                "index": str(index_path) if page_size else None
             },
+            "page_size": page_size,
             "features": [
-                {"id": f.id, "tasks": f.task_count, "incomplete": f.incomplete_tasks}
+                {
+                    "id": f.id,
+                    "tasks": f.task_count,
+                    "incomplete": f.incomplete_tasks,
+                    "workspaces": [ws.path for ws in f.workspaces],
+                    "backpressure_commands": f.backpressure_commands
+                }
                 for f in project.selected_features
             ] if project.structure == "features" else None,
             "analysis": {
@@ -698,7 +1499,8 @@ def main():
                 "total_tasks": project.total_tasks,
                 "incomplete_tasks": project.total_incomplete,
                 "max_iterations": max_iter,
-                "backpressure_commands": project.backpressure_commands
+                "backpressure_commands": project.backpressure_commands,
+                "constitution_rules": len(project.constitution_index.rules) if project.constitution_index else 0
             },
             "issues": project.issues,
             "command": f'/ralph-loop "Follow PROMPT.md" --max-iterations {max_iter} --completion-promise "ALL_TASKS_COMPLETE"'
@@ -707,6 +1509,8 @@ def main():
     else:
         print(f"✅ Generated: {prompt_path}")
         print(f"✅ Generated: {config_path}")
+        if page_size:
+            print(f"✅ Generated: {index_path}")
         print()
         print(f"📁 Structure: {project.structure}")
         